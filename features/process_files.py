@@ -4,129 +4,366 @@ from rich.progress import (
     SpinnerColumn,
     TextColumn,
     BarColumn,
-    TaskProgressColumn,
+    MofNCompleteColumn,
 )
 from rich.console import Console
 from utils import generate_filename
-from utils.types import File, FileType
+from utils.events import EventLog, HEADLESS_REFRESH_PER_SECOND
+from utils.types import File, FileType, PipelineConfig, Summary
 from features.files_with_dates import (
     remove_date_patterns_from_filename,
 )
-from features.files_with_no_dates.get_date_from_pdf import get_date_from_pdf
+from features.files_with_no_dates.extract_text_from_pdf_with_pypdf2 import (
+    extract_text_from_pdf_with_pypdf2,
+)
+from features.files_with_no_dates.get_date_from_pdf import get_date_from_pdf_text
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
+from typing import Callable, Iterable
+import queue
+import threading
+import time
+
+# Sent through a queue to tell one worker of the next stage that there is no more work
+_DONE = object()
+
+
+@dataclass
+class _Job:
+    """A file going through the pipeline, with what the stages found about it."""
+
+    file: File
+    started: float = field(default_factory=time.perf_counter)
+    text: str | None = None
+    date: datetime | None = None
+    error: str | None = None
+    timings: dict[str, float] = field(default_factory=dict)
+
+
+def _elapsed_ms(since: float) -> float:
+    return round((time.perf_counter() - since) * 1000, 1)
+
+
+def _drain(
+    inbox: queue.Queue,
+    handle: Callable[[_Job], None],
+    errors: list[Exception],
+    stop: threading.Event,
+) -> None:
+    """Handle jobs from a queue until receiving _DONE.
+
+    An unexpected error is collected and sets stop, after which remaining jobs are
+    discarded: the worker keeps consuming its queue so that upstream stages never
+    block on it. Aborting a confirmation prompt is raised right away.
+    """
+    while (job := inbox.get()) is not _DONE:
+        if stop.is_set():
+            continue
+        try:
+            handle(job)
+        except typer.Abort:
+            raise
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+
+
+def _start_stage(
+    workers: int,
+    inbox: queue.Queue,
+    handle: Callable[[_Job], None],
+    on_done: Callable[[], None],
+    errors: list[Exception],
+    stop: threading.Event,
+) -> list[threading.Thread]:
+    """Start worker threads for a stage; on_done is called once the last one finishes.
+
+    The inbox must receive one _DONE per worker.
+    """
+    remaining = [workers]
+    lock = threading.Lock()
+
+    def work() -> None:
+        _drain(inbox, handle, errors, stop)
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            on_done()
+
+    threads = [threading.Thread(target=work, daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    return threads
 
 
 def process_files(
-    files: list[File], console: Console, dry_run: bool
-) -> tuple[int, int, int]:
+    files: Iterable[File],
+    console: Console,
+    dry_run: bool,
+    quiet: bool = False,
+    assume_yes: bool = False,
+    event_log: EventLog | None = None,
+    config: PipelineConfig | None = None,
+) -> Summary:
     """Process files that need renaming and return counts of renamed, skipped, and already correct files.
 
     This function handles both files with dates in their names and PDF files without dates.
     For files with dates, it will clean the filename and rename it to YYYY-MM-DD format.
     For PDF files without dates, it will extract dates from their content using OpenAI.
 
+    Work runs as a pipeline of concurrent stages connected by bounded queues: reading
+    files (e.g. from a lazy directory scan), extracting PDF text, analyzing it with
+    OpenAI, and renaming. Each stage has its own number of workers and progress
+    counter, and blocks when the next stage's queue is full. When asking for
+    confirmation, renaming happens in the calling thread, one file at a time.
+    The first unexpected error, or aborting a confirmation, stops all stages.
+
+    In quiet mode, per-file console output is turned off and the progress bar is only
+    redrawn at a fixed, low rate. Each file's outcome can be recorded as a structured
+    event through event_log instead.
+
     Args:
-        files: List of files to process
+        files: Files to process, consumed as they are produced
         console: Console object for output
+        dry_run: Whether to only report renames without applying them
+        quiet: Whether to disable per-file console output
+        assume_yes: Whether to rename without asking for confirmation
+        event_log: Optional log receiving one "file" event per processed file
+        config: Number of workers per stage and size of the queues between them
 
     Returns:
-        tuple[int, int, int]: A tuple containing:
-            - Number of files that were renamed
-            - Number of files that were skipped (user declined or error)
-            - Number of files that were already in the correct format
+        Summary: Counts of renamed, skipped (user declined or error) and already
+            correct files, and total number of files processed
     """
-    renamed_count = 0
-    skipped_count = 0
-    already_correct = 0
+    summary = Summary()
+    summary_lock = threading.Lock()
+    errors: list[Exception] = []
+    stop = threading.Event()
+    event_log = event_log or EventLog()
+    config = config or PipelineConfig()
+    rename_workers: int = config.rename_workers if assume_yes else 1
+
+    extract_queue: queue.Queue = queue.Queue(maxsize=config.queue_size)
+    analyze_queue: queue.Queue = queue.Queue(maxsize=config.queue_size)
+    rename_queue: queue.Queue = queue.Queue(maxsize=config.queue_size)
 
-    # Create a single progress bar that will persist throughout the process
+    # Create a single progress display that will persist throughout the process
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         BarColumn(bar_width=40),
-        TaskProgressColumn(),
+        MofNCompleteColumn(),
         console=console,
         expand=True,
-        refresh_per_second=4,
+        refresh_per_second=HEADLESS_REFRESH_PER_SECOND if quiet else 4,
     ) as progress:
-        task = progress.add_task("[bold blue]Processing files...", total=len(files))
+        # Totals are unknown until the scan is over
+        scan_task = progress.add_task("[bold blue]Scanning files...", total=None)
+        extract_task = progress.add_task("[bold blue]Extracting PDF text...", total=None)
+        analyze_task = progress.add_task("[bold blue]Analyzing PDFs...", total=None)
+        rename_task = progress.add_task("[bold blue]Renaming files...", total=None)
+
+        def report(message: str, style: str) -> None:
+            if not quiet:
+                progress.console.print(message, style=style)
+
+        def record(job: _Job, decision: str, **fields) -> None:
+            event_log.emit(
+                "file",
+                path=str(job.file.path.absolute()),
+                decision=decision,
+                elapsed_ms=_elapsed_ms(job.started),
+                **job.timings,
+                **fields,
+            )
+
+        def count(name: str) -> None:
+            with summary_lock:
+                setattr(summary, name, getattr(summary, name) + 1)
+
+        # PDF helpers run in worker threads, where their output would be mixed up
+        # with other files and prompts: silence them, the rename stage reports results
+        pdf_console = Console(quiet=True)
+
+        def scan() -> None:
+            pdf_count = 0
+            try:
+                for file in files:
+                    if stop.is_set():
+                        break
+                    if file.date is not None:
+                        rename_queue.put(_Job(file))
+                    elif file.file_type == FileType.PDF:
+                        extract_queue.put(_Job(file))
+                        pdf_count += 1
+                    summary.total_files += 1
+                    progress.update(scan_task, advance=1)
+            except Exception as e:
+                errors.append(e)
+                stop.set()
+            finally:
+                progress.update(scan_task, total=summary.total_files)
+                progress.update(extract_task, total=pdf_count)
+                progress.update(analyze_task, total=pdf_count)
+                progress.update(rename_task, total=summary.total_files)
+                for _ in range(config.extract_workers):
+                    extract_queue.put(_DONE)
 
-        for i, file in enumerate(files, 1):
-            # Update progress before processing each file
-            progress.update(task, completed=i - 1)
+        def extract(job: _Job) -> None:
+            started: float = time.perf_counter()
+            try:
+                job.text = extract_text_from_pdf_with_pypdf2(job.file.path, pdf_console)
+            except Exception as e:
+                job.error = str(e)
+            job.timings["extract_ms"] = _elapsed_ms(started)
+            progress.update(extract_task, advance=1)
+            analyze_queue.put(job)
+
+        def analyze(job: _Job) -> None:
+            if job.error is None:
+                started: float = time.perf_counter()
+                try:
+                    job.date = get_date_from_pdf_text(
+                        job.file.path, job.text, pdf_console
+                    )
+                except Exception as e:
+                    job.error = str(e)
+                job.timings["analyze_ms"] = _elapsed_ms(started)
+            progress.update(analyze_task, advance=1)
+            rename_queue.put(job)
+
+        def rename(job: _Job) -> None:
+            file: File = job.file
+            progress.update(rename_task, advance=1)
 
             # Get the date either from filename or from PDF content
             if file.date is not None:
                 # File already has a date from filename
-                date = file.date
-                has_time = file.has_time
+                date: datetime = file.date
+                has_time: bool = file.has_time
                 cleaned_filename = remove_date_patterns_from_filename(file.path.name)
-                progress.console.print(
+                date_source = "filename"
+                report(
                     f"\nFound file with date: {file.path.absolute()}",
                     style="bright_blue",
                 )
-            elif file.file_type == FileType.PDF:
-                # Try to extract date from PDF content
-                progress.console.print(
+            else:
+                report(
                     f"\nFound PDF without date: {file.path.absolute()}",
                     style="bright_blue",
                 )
-                try:
-                    date: datetime | None = get_date_from_pdf(
-                        file.path, progress.console
-                    )
-                    if date is None:
-                        progress.console.print(
-                            "No date found in PDF content", style="yellow"
-                        )
-                        skipped_count += 1
-                        continue
-                    has_time = False  # We don't extract time from PDF content
-                    cleaned_filename = file.path.name  # Keep original filename
-                    progress.console.print(
-                        f"Found date in PDF: {date.strftime('%Y-%m-%d')}", style="green"
-                    )
-                except Exception as e:
-                    progress.console.print(
-                        f"Error processing PDF: {str(e)}", style="red"
-                    )
-                    skipped_count += 1
-                    continue
-            else:
-                # Skip files without dates that aren't PDFs
-                continue
+                date_source = "pdf"
+                if job.error is not None:
+                    report(f"Error processing PDF: {job.error}", style="red")
+                    record(job, "error", date_source=date_source, error=job.error)
+                    count("skipped_count")
+                    return
+                if job.date is None:
+                    report("No date found in PDF content", style="yellow")
+                    record(job, "no_date", date_source=date_source)
+                    count("skipped_count")
+                    return
+                date = job.date
+                has_time = False  # We don't extract time from PDF content
+                cleaned_filename = file.path.name  # Keep original filename
+                report(f"Found date in PDF: {date.strftime('%Y-%m-%d')}", style="green")
 
             # Rename files with found dates (either from filename or PDF)
             new_filename: str = generate_filename(cleaned_filename, date, has_time)
             new_path: Path = file.path.parent / new_filename
+            decided = {
+                "date_source": date_source,
+                "date": date.isoformat(),
+                "new_name": new_filename,
+            }
 
             # Skip if the new name is identical to the old name
             if new_filename == file.path.name:
-                already_correct += 1
-                continue
+                record(job, "already_correct", **decided)
+                count("already_correct")
+                return
 
-            # Temporarily hide the progress bar for the confirmation
-            progress.stop()
-            should_rename = typer.confirm(
-                f"Rename '{file.path.name}' to '{new_filename}'?"
-            )
-            progress.start()
+            if assume_yes:
+                should_rename = True
+            else:
+                # Temporarily hide the progress bar for the confirmation
+                progress.stop()
+                should_rename = typer.confirm(
+                    f"Rename '{file.path.name}' to '{new_filename}'?",
+                    err=console.stderr,
+                )
+                progress.start()
 
-            if should_rename:
-                if not dry_run:
-                    file.path.rename(new_path)
-                    progress.console.print(
-                        f"Renamed: {file.path.name} → {new_filename}", style="green"
-                    )
-                else:
-                    progress.console.print(
-                        f"Would have renamed: {file.path.name} → {new_filename}",
-                        style="green",
-                    )
-                renamed_count += 1
+            if not should_rename:
+                report(f"Skipped: {file.path.name}", style="yellow")
+                record(job, "skipped", **decided)
+                count("skipped_count")
+                return
+
+            if dry_run:
+                report(
+                    f"Would have renamed: {file.path.name} → {new_filename}",
+                    style="green",
+                )
+                record(job, "would_rename", **decided)
+                count("renamed_count")
+                return
+
+            try:
+                file.path.rename(new_path)
+            except OSError as e:
+                report(f"Error renaming {file.path.name}: {str(e)}", style="red")
+                record(job, "error", error=str(e), **decided)
+                count("skipped_count")
+                return
+            report(f"Renamed: {file.path.name} → {new_filename}", style="green")
+            record(job, "renamed", **decided)
+            count("renamed_count")
+
+        def close_queue(inbox: queue.Queue, workers: int) -> Callable[[], None]:
+            def close() -> None:
+                for _ in range(workers):
+                    inbox.put(_DONE)
+
+            return close
+
+        threads: list[threading.Thread] = [threading.Thread(target=scan, daemon=True)]
+        threads[0].start()
+        threads += _start_stage(
+            config.extract_workers,
+            extract_queue,
+            extract,
+            close_queue(analyze_queue, config.analyze_workers),
+            errors,
+            stop,
+        )
+        threads += _start_stage(
+            config.analyze_workers,
+            analyze_queue,
+            analyze,
+            close_queue(rename_queue, rename_workers),
+            errors,
+            stop,
+        )
+        try:
+            if assume_yes:
+                threads += _start_stage(
+                    rename_workers, rename_queue, rename, lambda: None, errors, stop
+                )
             else:
-                progress.console.print(f"Skipped: {file.path.name}", style="yellow")
-                skipped_count += 1
+                # Confirmation prompts must come from this thread, one at a time
+                _drain(rename_queue, rename, errors, stop)
+
+            for thread in threads:
+                thread.join()
+        except BaseException:
+            # Aborted prompt or Ctrl-C: keep other stages from picking up more work
+            stop.set()
+            raise
+
+    if errors:
+        raise errors[0]
 
-    return renamed_count, skipped_count, already_correct
+    return summary
@@ -13,9 +13,11 @@ import typer
 from pathlib import Path
 from rich.console import Console
 from dotenv import load_dotenv
-from utils import scan_directory_with_parser
-from utils.types import File
-from utils.summary import print_summary
+from utils import iter_directory_with_parser
+from utils.types import PipelineConfig, Summary
+from utils.events import EventLog
+from utils.shard import Shard, parse_shard
+from utils.summary import print_summary, write_summary
 from features.files_with_dates import parse_datetime_from_filename
 from features.process_files import process_files
 
@@ -24,6 +26,20 @@ load_dotenv()
 
 app = typer.Typer()
 console = Console()
+err_console = Console(stderr=True)
+
+
+def check_output_file(path: Path) -> None:
+    """Exit with an error if a file can't be created at this path."""
+    if path.is_dir():
+        console.print(f"Error: '{path}' is a directory", style="red")
+        raise typer.Exit(1)
+    if not path.parent.is_dir():
+        console.print(
+            f"Error: Folder '{path.parent}' for '{path}' does not exist",
+            style="red",
+        )
+        raise typer.Exit(1)
 
 
 @app.command()
@@ -37,6 +53,50 @@ def main(
     dry_run: bool = typer.Option(
         False, "--dry-run", "-d", help="Dry run / doesn't rename files"
     ),
+    yes: bool = typer.Option(
+        False, "--yes", "-y", help="Rename without asking for confirmation"
+    ),
+    quiet: bool = typer.Option(
+        False, "--quiet", "-q", help="Disable per-file output, throttle progress bar"
+    ),
+    jsonl: Path | None = typer.Option(
+        None,
+        "--jsonl",
+        help="Write JSON-lines events to this file ('-' for stdout), implies --quiet",
+    ),
+    shard: Shard | None = typer.Option(
+        None,
+        "--shard",
+        parser=parse_shard,
+        metavar="K/N",
+        help="Only process the K-th of N deterministic slices of the folder",
+    ),
+    shard_depth: int = typer.Option(
+        1,
+        "--shard-depth",
+        min=1,
+        help="Depth below the folder at which whole subtrees are assigned to shards",
+    ),
+    summary_file: Path | None = typer.Option(
+        None,
+        "--summary-file",
+        help="Save the summary as JSON, to merge shards with merge_summaries.py",
+    ),
+    extract_workers: int = typer.Option(
+        1,
+        "--extract-workers",
+        min=1,
+        help="Number of PDF text extraction threads (they share one CPU core)",
+    ),
+    analyze_workers: int = typer.Option(
+        4, "--analyze-workers", min=1, help="Number of concurrent OpenAI requests"
+    ),
+    rename_workers: int = typer.Option(
+        1, "--rename-workers", min=1, help="Number of rename workers (with --yes)"
+    ),
+    queue_size: int = typer.Option(
+        64, "--queue-size", min=1, help="Maximum number of files waiting per stage"
+    ),
 ):
     """
     Search for files with date patterns in their names and offer to rename them to YYYY-MM-DD format.
@@ -49,25 +109,61 @@ def main(
         console.print(f"Error: '{folder}' is not a directory", style="red")
         raise typer.Exit(1)
 
-    # Scan for files
-    files: list[File] = scan_directory_with_parser(
-        folder, parse_datetime_from_filename, recursive, console
-    )
-
-    if not files:
-        console.print("No files found.")
-        return
-
-    # Process all files
-    renamed_count: int
-    skipped_count: int
-    already_correct: int
-    renamed_count, skipped_count, already_correct = process_files(
-        files, console, dry_run
-    )
-
-    # Print summary
-    print_summary(renamed_count, skipped_count, already_correct, len(files), console)
+    if jsonl is not None and str(jsonl) != "-":
+        check_output_file(jsonl)
+
+    if summary_file is not None:
+        check_output_file(summary_file)
+
+    quiet = quiet or jsonl is not None
+
+    with EventLog(jsonl) as event_log:
+        # Keep stdout clean when it carries the JSON-lines stream
+        output: Console = err_console if event_log.to_stdout else console
+
+        if shard is not None and not recursive:
+            output.print(
+                "Warning: without --recursive, "
+                "the whole folder belongs to a single shard",
+                style="yellow",
+            )
+
+        # Process files while they are being scanned
+        summary: Summary = process_files(
+            iter_directory_with_parser(
+                folder, parse_datetime_from_filename, recursive, shard, shard_depth
+            ),
+            output,
+            dry_run,
+            quiet,
+            yes,
+            event_log,
+            PipelineConfig(extract_workers, analyze_workers, rename_workers, queue_size),
+        )
+
+        event_log.emit(
+            "summary",
+            renamed=summary.renamed_count,
+            skipped=summary.skipped_count,
+            already_correct=summary.already_correct,
+            total=summary.total_files,
+            shard=str(shard) if shard is not None else None,
+        )
+
+        if summary.total_files == 0:
+            output.print("No files found.")
+        else:
+            # Print summary
+            print_summary(
+                summary.renamed_count,
+                summary.skipped_count,
+                summary.already_correct,
+                summary.total_files,
+                output,
+            )
+
+        if summary_file is not None:
+            write_summary(summary, summary_file, shard)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,68 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# dependencies = [
+#     "typer",
+#     "rich",
+# ]
+# ///
+
+import typer
+from pathlib import Path
+from rich.console import Console
+from utils.shard import Shard, check_shards
+from utils.summary import merge_summaries, print_summary, read_summary
+from utils.types import Summary
+
+app = typer.Typer()
+console = Console()
+
+
+@app.command()
+def main(
+    summary_files: list[Path] = typer.Argument(
+        ..., help="Summary files saved by main.py --summary-file, one per shard"
+    ),
+):
+    """
+    Merge the summaries of all shards of the same run into a single report.
+    """
+    summaries: list[Summary] = []
+    shards: list[Shard] = []
+    for path in summary_files:
+        if not path.is_file():
+            console.print(f"Error: Summary file '{path}' does not exist", style="red")
+            raise typer.Exit(1)
+        try:
+            summary, shard = read_summary(path)
+        except ValueError as e:
+            console.print(f"Error: {str(e)}", style="red")
+            raise typer.Exit(1)
+        if shard is None and len(summary_files) > 1:
+            console.print(
+                f"Error: Summary file '{path}' was not saved by a sharded run",
+                style="red",
+            )
+            raise typer.Exit(1)
+        summaries.append(summary)
+        if shard is not None:
+            shards.append(shard)
+
+    if shards:
+        try:
+            check_shards(shards)
+        except ValueError as e:
+            console.print(f"Error: {str(e)}", style="red")
+            raise typer.Exit(1)
+
+    summary: Summary = merge_summaries(summaries)
+    print_summary(
+        summary.renamed_count,
+        summary.skipped_count,
+        summary.already_correct,
+        summary.total_files,
+        console,
+    )
+
+
+if __name__ == "__main__":
+    app()
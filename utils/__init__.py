@@ -1,9 +1,12 @@
 from utils.generate_new_filename import generate_filename
-from utils.scan_directory import scan_directory_with_parser
-from utils.summary import print_summary
+from utils.scan_directory import iter_directory_with_parser
+from utils.summary import print_summary, merge_summaries, read_summary, write_summary
 
 __all__ = [
     "generate_filename",
-    "scan_directory_with_parser",
+    "iter_directory_with_parser",
     "print_summary",
+    "merge_summaries",
+    "read_summary",
+    "write_summary",
 ]
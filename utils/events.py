@@ -0,0 +1,76 @@
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, TextIO
+
+# Progress bar refresh rate used in quiet/headless mode, instead of rich's default
+HEADLESS_REFRESH_PER_SECOND = 1
+
+
+class EventLog:
+    """Buffered writer for structured JSON-lines events.
+
+    Events are kept in memory and written out in batches, so large runs don't pay for
+    a write per file. Events can be emitted from several threads. Passing "-" as
+    destination writes to stdout; passing None creates a disabled log that drops
+    every event.
+    """
+
+    def __init__(self, destination: Path | None = None, buffer_size: int = 1000):
+        self.buffer_size = buffer_size
+        self._buffer: list[str] = []
+        self._lock = threading.Lock()
+        self._owns_stream = False
+        self._stream: TextIO | None = None
+        if destination is not None:
+            if str(destination) == "-":
+                self._stream = sys.stdout
+            else:
+                self._stream = open(destination, "w", encoding="utf-8")
+                self._owns_stream = True
+
+    @property
+    def enabled(self) -> bool:
+        return self._stream is not None
+
+    @property
+    def to_stdout(self) -> bool:
+        return self._stream is sys.stdout
+
+    def emit(self, event: str, **fields: Any) -> None:
+        """Queue a single event, flushing the buffer once it is full."""
+        if self._stream is None:
+            return
+        record = {"event": event, "ts": round(time.time(), 3), **fields}
+        line = json.dumps(record, default=str, ensure_ascii=False)
+        with self._lock:
+            self._buffer.append(line)
+            if len(self._buffer) >= self.buffer_size:
+                self._write_buffer()
+
+    def flush(self) -> None:
+        """Write all buffered events to the destination."""
+        with self._lock:
+            self._write_buffer()
+
+    def _write_buffer(self) -> None:
+        if self._stream is None or not self._buffer:
+            return
+        self._stream.write("\n".join(self._buffer) + "\n")
+        self._stream.flush()
+        self._buffer.clear()
+
+    def close(self) -> None:
+        """Flush remaining events and close the destination if we opened it."""
+        self.flush()
+        if self._owns_stream and self._stream is not None:
+            self._stream.close()
+        self._stream = None
+
+    def __enter__(self) -> "EventLog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
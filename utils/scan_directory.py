@@ -1,76 +1,85 @@
+import os
 from pathlib import Path
-from typing import TypeVar, Callable
-from rich.progress import (
-    Progress,
-    SpinnerColumn,
-    TextColumn,
-    BarColumn,
-    TaskProgressColumn,
-)
-from rich.console import Console
+from typing import TypeVar, Callable, Iterator
 from utils.types import File, FileType
+from utils.shard import Shard
 
 T = TypeVar("T")
 
 
-def scan_directory_with_parser(
+def _iter_files(
+    folder: Path, recursive: bool, shard: Shard | None, shard_depth: int
+) -> Iterator[Path]:
+    """Lazily list files in a directory, keeping only those owned by the given shard.
+
+    Subtrees rooted shard_depth levels below the folder are assigned as a whole to a
+    shard, so other shards never descend into them. Directories above that level are
+    walked by every shard, but their own files only belong to the shard owning them.
+    """
+    if not recursive:
+        if shard is None or shard.owns(Path(".")):
+            yield from (f for f in folder.glob("*") if f.is_file())
+        return
+
+    for dirpath, dirnames, filenames in os.walk(folder):
+        directory = Path(dirpath)
+        if shard is not None:
+            relative: Path = directory.relative_to(folder)
+            depth: int = len(relative.parts)
+            if depth + 1 == shard_depth:
+                # Only descend into subtrees this shard owns
+                dirnames[:] = [d for d in dirnames if shard.owns(relative / d)]
+            if depth < shard_depth and not shard.owns(relative):
+                continue
+        # Filter only files (not broken links or other special entries)
+        yield from (
+            directory / name for name in filenames if (directory / name).is_file()
+        )
+
+
+def _parse_file(file_path: Path, parser: Callable[[str], T | None]) -> File | None:
+    """Build a File from a path if its name has a date or if it is a PDF, else None."""
+    result: T | None = parser(file_path.name)
+    if result is not None:
+        # Unpack the tuple if result is a tuple
+        if isinstance(result, tuple):
+            date, has_time = result
+            return File(file_path, FileType.REGULAR, date, has_time)
+        # This case should not happen with parse_datetime_from_filename
+        # but kept for generic parser compatibility
+        return File(file_path, FileType.REGULAR, result, False)
+    if file_path.suffix.lower() == ".pdf":
+        # If no date found and it's a PDF, add it as a PDF file
+        return File(file_path, FileType.PDF)
+    return None
+
+
+def iter_directory_with_parser(
     folder: Path,
     parser: Callable[[str], T | None],
     recursive: bool,
-    console: Console,
-) -> list[File]:
+    shard: Shard | None = None,
+    shard_depth: int = 1,
+) -> Iterator[File]:
     """
-    Scan directory for files and apply a parser function to each filename.
+    Lazily scan directory for files and apply a parser function to each filename.
+
+    Files are yielded as soon as they are found, so that processing can start
+    before the whole tree is walked.
 
     Args:
         folder: Directory to scan
         parser: Function that takes a filename and returns a result or None
         recursive: Whether to scan subdirectories
-        console: Console object for progress display
+        shard: Only scan the part of the tree owned by this shard, if given
+        shard_depth: Depth below folder at which whole subtrees are assigned to shards
 
-    Returns:
-        List of File objects containing the file path and parsed information.
+    Yields:
+        File objects containing the file path and parsed information.
         Files with dates will have date and has_time set.
         PDF files without dates will have file_type set to PDF and date set to None.
     """
-    # Get all files in the directory
-    if recursive:
-        files: list[Path] = list(folder.rglob("*"))
-    else:
-        files: list[Path] = list(folder.glob("*"))
-
-    # Filter only files (not directories)
-    files = [f for f in files if f.is_file()]
-
-    # Collect files with matching results
-    processed_files: list[File] = []
-
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        BarColumn(),
-        TaskProgressColumn(),
-        console=console,
-    ) as progress:
-        task = progress.add_task("Scanning files...", total=len(files))
-        for file_path in files:
-            result: T | None = parser(file_path.name)
-            if result is not None:
-                # Unpack the tuple if result is a tuple
-                if isinstance(result, tuple):
-                    date, has_time = result
-                    processed_files.append(
-                        File(file_path, FileType.REGULAR, date, has_time)
-                    )
-                else:
-                    # This case should not happen with parse_datetime_from_filename
-                    # but kept for generic parser compatibility
-                    processed_files.append(
-                        File(file_path, FileType.REGULAR, result, False)
-                    )
-            elif file_path.suffix.lower() == ".pdf":
-                # If no date found and it's a PDF, add it as a PDF file
-                processed_files.append(File(file_path, FileType.PDF))
-            progress.update(task, advance=1)
-
-    return processed_files
+    for file_path in _iter_files(folder, recursive, shard, shard_depth):
+        file: File | None = _parse_file(file_path, parser)
+        if file is not None:
+            yield file
@@ -0,0 +1,59 @@
+import hashlib
+import os
+from collections import Counter
+import typer
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass(frozen=True)
+class Shard:
+    """One of `count` deterministic slices of a directory tree (index is 1-based)."""
+
+    index: int
+    count: int
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+    def owns(self, relative_dir: Path) -> bool:
+        """Return whether this shard owns a directory, given its path relative to the scanned root.
+
+        Ownership only depends on the relative path, so every node agrees on it
+        regardless of where the share is mounted.
+        """
+        digest = hashlib.blake2b(
+            os.fsencode(relative_dir.as_posix()), digest_size=8
+        ).digest()
+        return int.from_bytes(digest, "big") % self.count == self.index - 1
+
+
+def parse_shard(value: str) -> Shard:
+    """Parse a shard specification of the form "K/N", with 1 <= K <= N."""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise typer.BadParameter(f"expected K/N (e.g. 1/4), got '{value}'")
+    if count < 1 or not 1 <= index <= count:
+        raise typer.BadParameter(f"K must be between 1 and N, got '{value}'")
+    return Shard(index, count)
+
+
+def check_shards(shards: list[Shard]) -> None:
+    """Check that shards cover a whole run: the same N, and each K from 1 to N once.
+
+    Raises ValueError describing the first problem found.
+    """
+    counts: set[int] = {shard.count for shard in shards}
+    if len(counts) > 1:
+        raise ValueError(
+            f"Shards come from runs split {', '.join(map(str, sorted(counts)))} ways"
+        )
+    count: int = counts.pop()
+    seen: Counter = Counter(shard.index for shard in shards)
+    duplicates = [f"{k}/{count}" for k in sorted(seen) if seen[k] > 1]
+    if duplicates:
+        raise ValueError(f"Duplicate shards: {', '.join(duplicates)}")
+    missing = [f"{k}/{count}" for k in range(1, count + 1) if k not in seen]
+    if missing:
+        raise ValueError(f"Missing shards: {', '.join(missing)}")
@@ -1,4 +1,10 @@
+import json
+from dataclasses import asdict, fields
+from pathlib import Path
+import typer
 from rich.console import Console
+from utils.shard import Shard, parse_shard
+from utils.types import Summary
 
 
 def print_summary(
@@ -14,3 +20,36 @@ def print_summary(
     console.print(f"Files renamed: {renamed_count}", style="green")
     console.print(f"Files skipped: {skipped_count}", style="yellow")
     console.print(f"Total files processed: {total_files}", style="bold")
+
+
+def write_summary(summary: Summary, path: Path, shard: Shard | None = None) -> None:
+    """Save a summary as JSON, with the shard it covers, to merge shards later."""
+    data = {"shard": str(shard) if shard is not None else None, **asdict(summary)}
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def read_summary(path: Path) -> tuple[Summary, Shard | None]:
+    """Load a summary and its shard previously saved with write_summary.
+
+    Raises ValueError if the file is not a valid summary.
+    """
+    try:
+        data: dict = json.loads(path.read_text(encoding="utf-8"))
+        summary = Summary(**{f.name: int(data[f.name]) for f in fields(Summary)})
+        shard: Shard | None = (
+            parse_shard(data["shard"]) if data.get("shard") is not None else None
+        )
+    except KeyError as e:
+        raise ValueError(f"Invalid summary file '{path}': missing {e}")
+    except (ValueError, TypeError, AttributeError, typer.BadParameter) as e:
+        raise ValueError(f"Invalid summary file '{path}': {e}")
+    return summary, shard
+
+
+def merge_summaries(summaries: list[Summary]) -> Summary:
+    """Add up the counts of several summaries into a single one."""
+    merged = Summary()
+    for summary in summaries:
+        for f in fields(Summary):
+            setattr(merged, f.name, getattr(merged, f.name) + getattr(summary, f.name))
+    return merged
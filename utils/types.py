@@ -20,3 +20,23 @@ class File:
     file_type: FileType
     date: datetime | None = None
     has_time: bool = False
+
+
+@dataclass
+class Summary:
+    """Counts of renaming operations, mergeable across shards of the same run."""
+
+    renamed_count: int = 0
+    skipped_count: int = 0
+    already_correct: int = 0
+    total_files: int = 0
+
+
+@dataclass
+class PipelineConfig:
+    """Number of concurrent workers for each processing stage, and size of the queues between them."""
+
+    extract_workers: int = 1  # PDF text extraction (CPU, holds the GIL)
+    analyze_workers: int = 4  # OpenAI date analysis (network)
+    rename_workers: int = 1  # Renaming (disk), only used when not asking for confirmation
+    queue_size: int = 64